@@ -1,45 +1,42 @@
 import os
-from pydantic import BaseModel, Field
-from typing import Any, Optional
+from dataclasses import dataclass
+from typing import Any, ClassVar, Optional
 
 from langchain_core.runnables import RunnableConfig
 
+_gemini_model = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
 
-class Configuration(BaseModel):
+
+@dataclass(slots=True)
+class Configuration:
     """The configuration for the agent."""
 
-    _gemini_model = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
-    print(f"[DEBUG] GEMINI_MODEL being used for all LLM calls: {_gemini_model}")
+    query_generator_model: str = _gemini_model
+    """The name of the language model to use for the agent's query generation."""
 
-    query_generator_model: str = Field(
-        default=_gemini_model,
-        metadata={
-            "description": "The name of the language model to use for the agent's query generation."
-        },
-    )
+    reflection_model: str = _gemini_model
+    """The name of the language model to use for the agent's reflection."""
 
-    reflection_model: str = Field(
-        default=_gemini_model,
-        metadata={
-            "description": "The name of the language model to use for the agent's reflection."
-        },
-    )
+    answer_model: str = _gemini_model
+    """The name of the language model to use for the agent's answer."""
 
-    answer_model: str = Field(
-        default=_gemini_model,
-        metadata={
-            "description": "The name of the language model to use for the agent's answer."
-        },
-    )
+    number_of_initial_queries: int = 6
+    """The number of initial search queries to generate."""
 
-    number_of_initial_queries: int = Field(
-        default=6,
-        metadata={"description": "The number of initial search queries to generate."},
-    )
+    max_research_loops: int = 8
+    """The maximum number of research loops to perform."""
 
-    max_research_loops: int = Field(
-        default=8,
-        metadata={"description": "The maximum number of research loops to perform."},
+    # Field names (and their env-var spellings) cached once so
+    # from_runnable_config does not rebuild them on every invocation
+    _FIELD_NAMES: ClassVar[tuple[str, ...]] = (
+        "query_generator_model",
+        "reflection_model",
+        "answer_model",
+        "number_of_initial_queries",
+        "max_research_loops",
+    )
+    _FIELD_NAMES_UPPER: ClassVar[tuple[str, ...]] = tuple(
+        name.upper() for name in _FIELD_NAMES
     )
 
     @classmethod
@@ -53,11 +50,15 @@ class Configuration(BaseModel):
 
         # Get raw values from environment or config
         raw_values: dict[str, Any] = {
-            name: os.environ.get(name.upper(), configurable.get(name))
-            for name in cls.model_fields.keys()
+            name: os.environ.get(env_name, configurable.get(name))
+            for name, env_name in zip(cls._FIELD_NAMES, cls._FIELD_NAMES_UPPER)
         }
 
-        # Filter out None values
-        values = {k: v for k, v in raw_values.items() if v is not None}
+        # Filter out None values, coercing int fields set via environment
+        values = {
+            k: int(v) if k in ("number_of_initial_queries", "max_research_loops") else v
+            for k, v in raw_values.items()
+            if v is not None
+        }
 
         return cls(**values)
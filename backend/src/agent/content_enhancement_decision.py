@@ -2,14 +2,112 @@
 Intelligent Content Enhancement Decision Module - Determines when to use Firecrawl for deep content crawling
 """
 
+import functools
+import heapq
+import logging
 import os
+import re
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.runnables import RunnableConfig
-from firecrawl import FirecrawlApp
 
-@dataclass
+from agent.configuration import Configuration
+
+# FirecrawlApp and ChatGoogleGenerativeAI are imported lazily at first use:
+# both pull in heavy dependency chains (httpx, LangChain pydantic schema
+# builds) that cost startup latency even when enhancement never runs.
+
+# Read API keys once at import time - env access is a dict lookup per call
+# and these values never change during the process lifetime
+_FIRECRAWL_API_KEY = os.environ.get("FIRECRAWL_API_KEY")
+_GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_reflection_llm(model: str, api_key: Optional[str]):
+    """Return a shared ChatGoogleGenerativeAI instance for the given model.
+
+    Constructing a LangChain LLM wrapper builds pydantic validators and an
+    HTTP client; caching one per model reuses its connection pool across
+    research loops.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=0.3,  # Low temperature for consistency
+        max_retries=2,
+        api_key=api_key,
+    )
+
+# Compiled once - _parse_llm_decision runs on every research loop.
+# One alternation collects every decision marker (and the confidence value)
+# in a single sweep over the lowered LLM response instead of one substring
+# search per keyword.
+_DECISION_RE = re.compile(
+    r'(no_enhance|enhance|selective|comprehensive|confidence.*?([0-9]\.[0-9]))'
+)
+
+# URL priority heuristics as compiled alternations - one C-level scan per
+# field instead of a Python generator over literal lists per source
+_URL_DOMAIN_RE = re.compile(r'\.(gov|edu|org)\b')
+_URL_PLATFORM_RE = re.compile(r'wikipedia|arxiv|ieee|acm')
+_URL_COMPANY_RE = re.compile(r'google|microsoft|amazon|tesla|nvidia')
+_TITLE_KW_RE = re.compile(r'report|study|research|analysis|technical')
+
+# Digit probe for quality assessment - regex search short-circuits at the
+# first digit in C instead of iterating the string in Python
+_DIGIT_RE = re.compile(r'\d')
+
+# Static prompt body built once - only the dynamic fields are formatted in
+# per call
+_ANALYSIS_PROMPT_TEMPLATE = """You are a research quality assessment expert. Analyze current research quality and determine if deep content enhancement is needed.
+
+Research Topic: {research_topic}
+
+Current Findings:
+{findings_summary}
+
+Available Sources:
+{sources_list}
+
+Evaluation Criteria:
+
+1. **Signals of Insufficient Depth**:
+   - Lack of specific data, statistics, case studies
+   - Vague descriptions, missing technical details
+   - Missing key companies/projects/implementations
+   - Low-quality sources (non-authoritative)
+
+2. **When Deep Crawling is Needed**:
+   - Topic requires detailed technical explanations
+   - Missing key supporting data
+   - Authoritative sources with truncated content
+   - Need for complete reports/studies
+
+3. **Source Value Assessment**:
+   - Official sites/docs: High value
+   - Academic papers/studies: High value
+   - Wikipedia/Encyclopedias: Medium value
+   - News articles: Varies by detail
+   - Blogs/Forums: Low value
+
+Response Format:
+
+**Decision**: [ENHANCE/NO_ENHANCE]
+**Confidence**: [0.1-1.0]
+**Enhancement Type**: [selective/comprehensive/none]
+**URLs to Process**: [0-3]
+**Reasoning**:
+[Explain your assessment, including content gaps and expected improvements]
+
+**Priority URLs** (if enhancing):
+[Top URLs for deep crawling, in priority order]"
+"""
+
+@dataclass(slots=True, frozen=True)
 class EnhancementDecision:
     """Content enhancement decision result"""
     needs_enhancement: bool
@@ -24,8 +122,10 @@ class ContentEnhancementDecisionMaker:
     
     def __init__(self):
         self.firecrawl_app = None
-        if os.getenv("FIRECRAWL_API_KEY"):
-            self.firecrawl_app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
+        if _FIRECRAWL_API_KEY:
+            from firecrawl import FirecrawlApp
+
+            self.firecrawl_app = FirecrawlApp(api_key=_FIRECRAWL_API_KEY)
     
     def analyze_enhancement_need(
         self, 
@@ -46,18 +146,12 @@ class ContentEnhancementDecisionMaker:
             research_topic, current_findings, grounding_sources
         )
         
-        # Use LLM for intelligent decision making
-        from agent.configuration import Configuration
+        # Use LLM for intelligent decision making (same model as reflection)
         configurable = Configuration.from_runnable_config(config)
-        
-        print(f"[DEBUG] analyze_enhancement_need: Using model for LLM: {configurable.reflection_model}")
-        llm = ChatGoogleGenerativeAI(
-            model=configurable.reflection_model,  # Use same model as reflection
-            temperature=0.3,  # Low temperature for consistency
-            max_retries=2,
-            api_key=os.getenv("GEMINI_API_KEY"),
-        )
-        
+
+        logger.debug("analyze_enhancement_need: Using model for LLM: %s", configurable.reflection_model)
+        llm = _get_reflection_llm(configurable.reflection_model, _GEMINI_API_KEY)
+
         response = llm.invoke(analysis_prompt)
         decision_text = response.content if hasattr(response, 'content') else str(response)
         
@@ -73,55 +167,17 @@ class ContentEnhancementDecisionMaker:
         """Build analysis prompt"""
         
         findings_summary = "\n---\n".join(current_findings[-3:])  # Last 3 results
-        
-        sources_list = "\n".join([
+
+        sources_list = "\n".join(
             f"- {source.get('title', 'N/A')}: {source.get('url', 'N/A')}"
             for source in grounding_sources[:5]  # First 5 sources
-        ])
-        
-        return f"""You are a research quality assessment expert. Analyze current research quality and determine if deep content enhancement is needed.
-
-Research Topic: {research_topic}
-
-Current Findings:
-{findings_summary}
-
-Available Sources:
-{sources_list}
-
-Evaluation Criteria:
-
-1. **Signals of Insufficient Depth**:
-   - Lack of specific data, statistics, case studies
-   - Vague descriptions, missing technical details
-   - Missing key companies/projects/implementations
-   - Low-quality sources (non-authoritative)
-
-2. **When Deep Crawling is Needed**:
-   - Topic requires detailed technical explanations
-   - Missing key supporting data
-   - Authoritative sources with truncated content
-   - Need for complete reports/studies
-
-3. **Source Value Assessment**:
-   - Official sites/docs: High value
-   - Academic papers/studies: High value  
-   - Wikipedia/Encyclopedias: Medium value
-   - News articles: Varies by detail
-   - Blogs/Forums: Low value
-
-Response Format:
-
-**Decision**: [ENHANCE/NO_ENHANCE]
-**Confidence**: [0.1-1.0]
-**Enhancement Type**: [selective/comprehensive/none]
-**URLs to Process**: [0-3]
-**Reasoning**: 
-[Explain your assessment, including content gaps and expected improvements]
+        )
 
-**Priority URLs** (if enhancing):
-[Top URLs for deep crawling, in priority order]"
-"""
+        return _ANALYSIS_PROMPT_TEMPLATE.format(
+            research_topic=research_topic,
+            findings_summary=findings_summary,
+            sources_list=sources_list,
+        )
 
     def _parse_llm_decision(
         self, 
@@ -131,25 +187,31 @@ Response Format:
         """Parse LLM's decision result"""
         
         decision_text = decision_text.lower()
-        
+
+        # Collect all decision markers in a single pass over the text
+        markers = {"no_enhance": False, "enhance": False,
+                   "selective": False, "comprehensive": False}
+        confidence_score = None
+        for match in _DECISION_RE.finditer(decision_text):
+            token = match.group(1)
+            if token in markers:
+                markers[token] = True
+            elif match.group(2) and confidence_score is None:
+                try:
+                    confidence_score = float(match.group(2))
+                except:
+                    pass
+        if confidence_score is None:
+            confidence_score = 0.5  # Default
+
         # Parse basic decision
-        needs_enhancement = "enhance" in decision_text and "no_enhance" not in decision_text
-        
-        # Parse confidence score
-        confidence_score = 0.5  # Default
-        import re
-        confidence_match = re.search(r'confidence.*?([0-9]\.[0-9])', decision_text)
-        if confidence_match:
-            try:
-                confidence_score = float(confidence_match.group(1))
-            except:
-                pass
-        
+        needs_enhancement = markers["enhance"] and not markers["no_enhance"]
+
         # Parse enhancement type
         enhancement_type = "none"
-        if "selective" in decision_text:
+        if markers["selective"]:
             enhancement_type = "selective"
-        elif "comprehensive" in decision_text:
+        elif markers["comprehensive"]:
             enhancement_type = "comprehensive"
         elif needs_enhancement:
             enhancement_type = "selective"  # Default to selective enhancement
@@ -157,16 +219,16 @@ Response Format:
         # Select priority URLs (simplified version, can be improved with LLM selection)
         priority_urls = []
         if needs_enhancement and grounding_sources:
-            # Simple priority algorithm
-            scored_sources = []
-            for source in grounding_sources:
-                score = self._calculate_url_priority(source)
-                scored_sources.append((source, score))
-            
-            # Sort by score, select top 2-3
-            scored_sources.sort(key=lambda x: x[1], reverse=True)
+            # Top 2-3 by priority score - O(N log k) heap selection instead
+            # of scoring into a full list and sorting it
             max_urls = 3 if enhancement_type == "comprehensive" else 2
-            
+            top_sources = heapq.nlargest(
+                max_urls,
+                ((self._calculate_url_priority(source), source)
+                 for source in grounding_sources),
+                key=lambda x: x[0],
+            )
+
             priority_urls = [
                 {
                     "title": source.get("title", ""),
@@ -174,7 +236,7 @@ Response Format:
                     "priority_score": score,
                     "reasoning": f"Score: {score:.2f}"
                 }
-                for source, score in scored_sources[:max_urls]
+                for score, source in top_sources
                 if score > 0.3  # Only select higher scoring ones
             ]
         
@@ -188,25 +250,31 @@ Response Format:
     
     def _calculate_url_priority(self, source: Dict[str, Any]) -> float:
         """Calculate URL priority score"""
+        url = source.get("url")
+        if not url:
+            # Sources without a URL can't be crawled and would be dropped
+            # by the score filter anyway - skip the scans entirely
+            return 0.0
+
         score = 0.0
-        
-        url = source.get("url", "").lower()
+
+        url = url.lower()
         title = source.get("title", "").lower()
-        
+
         # Official websites and documentation
-        if any(domain in url for domain in [".gov", ".edu", ".org"]):
+        if _URL_DOMAIN_RE.search(url):
             score += 0.4
-        
+
         # Well-known platforms
-        if any(platform in url for platform in ["wikipedia", "arxiv", "ieee", "acm"]):
+        if _URL_PLATFORM_RE.search(url):
             score += 0.3
-        
+
         # Technical content indicators
-        if any(keyword in title for keyword in ["report", "study", "research", "analysis", "technical"]):
+        if _TITLE_KW_RE.search(title):
             score += 0.2
-        
+
         # Company websites
-        if any(company in url for company in ["google", "microsoft", "amazon", "tesla", "nvidia"]):
+        if _URL_COMPANY_RE.search(url):
             score += 0.2
         
         # Base score
@@ -231,7 +299,7 @@ Response Format:
                 continue
             
             try:
-                print(f"🔥 Firecrawl enhancement: {url_info.get('title', 'Unknown')}")
+                logger.info("🔥 Firecrawl enhancement: %s", url_info.get('title', 'Unknown'))
                 
                 result = self.firecrawl_app.scrape_url(url)
                 
@@ -248,12 +316,12 @@ Response Format:
                         "source_type": "firecrawl_enhanced"
                     })
                     
-                    print(f"  ✅ Enhancement successful: {len(markdown_content)} characters")
+                    logger.info("  ✅ Enhancement successful: %d characters", len(markdown_content))
                 else:
-                    print(f"  ❌ Enhancement failed: {result.error if hasattr(result, 'error') else 'Unknown error'}")
-                    
+                    logger.info("  ❌ Enhancement failed: %s", result.error if hasattr(result, 'error') else 'Unknown error')
+
             except Exception as e:
-                print(f"  ❌ Enhancement error: {str(e)}")
+                logger.info("  ❌ Enhancement error: %s", e)
                 continue
         
         return enhanced_results
@@ -264,8 +332,9 @@ Response Format:
             return "poor"
         
         length = len(content)
-        has_data = any(char.isdigit() for char in content)
-        has_structure = any(marker in content for marker in ['#', '##', '###'])
+        has_data = bool(_DIGIT_RE.search(content))
+        # '##' and '###' both imply '#', so one containment check suffices
+        has_structure = '#' in content
         
         if length > 5000 and has_data and has_structure:
             return "excellent"
@@ -278,11 +347,10 @@ Response Format:
 
 
 # Lazy initialization function to avoid circular imports
+@functools.cache
 def get_content_enhancement_decision_maker():
     """Get content enhancement decision maker instance (lazy initialization)"""
-    if not hasattr(get_content_enhancement_decision_maker, '_instance'):
-        get_content_enhancement_decision_maker._instance = ContentEnhancementDecisionMaker()
-    return get_content_enhancement_decision_maker._instance
+    return ContentEnhancementDecisionMaker()
 
 # For backward compatibility, keep the original global variable name
 content_enhancement_decision_maker = None  # Will be initialized on first use
\ No newline at end of file
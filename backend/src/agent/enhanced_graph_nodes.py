@@ -2,8 +2,12 @@
 Enhanced Graph Nodes - Integrates intelligent Firecrawl content enhancement
 """
 
+import functools
+import logging
 import os
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from datetime import datetime
 from langchain_core.runnables import RunnableConfig
@@ -16,6 +20,28 @@ from agent.content_enhancement_decision import (
 )
 from agent.utils import get_research_topic
 
+# Cap on how much scraped markdown is kept in state. Firecrawl can return
+# hundreds of KB per page while downstream formatting only uses the first
+# few KB, so truncating at capture time bounds state-checkpoint size.
+_CONTENT_LIMIT = 8000
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def _firecrawl_key() -> str | None:
+    """Return the Firecrawl API key, reading the environment only once."""
+    return os.getenv("FIRECRAWL_API_KEY")
+
+
+def _safe_scrape(scrape_url, url_info: Dict[str, Any]):
+    """Scrape a single URL, returning the raised exception instead of propagating it."""
+    logger.info("  Crawling: %s", url_info.get('title', 'Unknown'))
+    try:
+        return scrape_url(url_info["url"])
+    except Exception as e:
+        return e
+
 
 def content_enhancement_analysis(state: OverallState, config: RunnableConfig) -> dict:
     """
@@ -43,35 +69,37 @@ def content_enhancement_analysis(state: OverallState, config: RunnableConfig) ->
         # Get current research findings
         current_findings = state.get("web_research_result", [])
         
-        # Get grounding sources (extracted from recent search results)
-        grounding_sources = []
+        # Get grounding sources (the 10 most recent search results). A
+        # bounded deque avoids slicing a copy of sources_gathered, and the
+        # source dicts are passed through as-is - the decision maker reads
+        # title/url via .get() on demand
         sources_gathered = state.get("sources_gathered", [])
-        for source in sources_gathered[-10:]:  # 最近的10个源
-            if isinstance(source, dict):
-                grounding_sources.append({
-                    "title": source.get("title", ""),
-                    "url": source.get("url", ""),
-                    "snippet": source.get("snippet", "")
-                })
+        grounding_sources = [
+            source
+            for source in deque(sources_gathered, maxlen=10)
+            if isinstance(source, dict)
+        ]
         
-        print("🤔 Analyzing content enhancement needs...")
-        print(f"  Research Topic: {research_topic}")
-        print(f"  Current Findings Count: {len(current_findings)}")
-        print(f"  Available Sources: {len(grounding_sources)}")
+        logger.info("🤔 Analyzing content enhancement needs...")
+        logger.info("  Research Topic: %s", research_topic)
+        logger.info("  Current Findings Count: %d", len(current_findings))
+        logger.info("  Available Sources: %d", len(grounding_sources))
         
-        # Use intelligent decision maker for analysis
-        decision = get_content_enhancement_decision_maker().analyze_enhancement_need(
+        # Use intelligent decision maker for analysis (resolved once per node run)
+        decision_maker = get_content_enhancement_decision_maker()
+        decision = decision_maker.analyze_enhancement_need(
             research_topic=research_topic,
             current_findings=current_findings,
             grounding_sources=grounding_sources,
             config=config
         )
         
-        print(f"📊 Enhancement Decision Results:")
-        print(f"  Enhancement Needed: {decision.needs_enhancement}")
-        print(f"  Confidence: {decision.confidence_score:.2f}")
-        print(f"  Enhancement Type: {decision.enhancement_type}")
-        print(f"  Priority URLs Count: {len(decision.priority_urls)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(format_enhancement_decision_log(decision))
+        else:
+            logger.info("📊 Enhancement decision: needs=%s type=%s confidence=%.2f urls=%d",
+                        decision.needs_enhancement, decision.enhancement_type,
+                        decision.confidence_score, len(decision.priority_urls))
         
         # Save decision to state
         state_update = {
@@ -86,65 +114,79 @@ def content_enhancement_analysis(state: OverallState, config: RunnableConfig) ->
         
         # If no enhancement needed, return directly
         if not decision.needs_enhancement:
-            print("✅ Current content quality is sufficient, no enhancement needed")
+            logger.info("✅ Current content quality is sufficient, no enhancement needed")
             state_update["enhancement_status"] = "skipped"
             return state_update
         
         # Skip enhancement if no Firecrawl API Key
-        if not get_content_enhancement_decision_maker().firecrawl_app:
-            print("⚠️ Missing FIRECRAWL_API_KEY, skipping content enhancement")
+        if not decision_maker.firecrawl_app:
+            logger.info("⚠️ Missing FIRECRAWL_API_KEY, skipping content enhancement")
             state_update["enhancement_status"] = "skipped_no_api"
             return state_update
         
         # Execute content enhancement
-        print(f"🔥 Executing Firecrawl content enhancement...")
+        logger.info("🔥 Executing Firecrawl content enhancement...")
         enhanced_results = []
-        
-        # Synchronous call (simplified for now, can be made async later)
-        for url_info in decision.priority_urls:
-            url = url_info.get("url")
-            if not url:
-                continue
-            
+
+        # Bind lookups once - avoids re-resolving the singleton and its
+        # attributes on every URL. One timestamp covers the whole batch;
+        # the value is only audit metadata, not a per-URL measurement.
+        scrape_url = decision_maker.firecrawl_app.scrape_url
+        batch_timestamp = datetime.now().isoformat()
+
+        # Scrape all priority URLs concurrently - each crawl is independent
+        # network I/O and dominates the node's wall time when run serially
+        crawl_targets = [u for u in decision.priority_urls if u.get("url")]
+        with ThreadPoolExecutor(max_workers=max(len(crawl_targets), 1)) as executor:
+            scrape_results = list(executor.map(
+                lambda u: _safe_scrape(scrape_url, u), crawl_targets
+            ))
+
+        for url_info, result in zip(crawl_targets, scrape_results):
+            url = url_info["url"]
+
             try:
-                print(f"  Crawling: {url_info.get('title', 'Unknown')}")
-                
-                result = get_content_enhancement_decision_maker().firecrawl_app.scrape_url(url)
-                
+                if isinstance(result, Exception):
+                    raise result
+
                 if result and result.success:
-                    markdown_content = result.markdown or ''
-                    
+                    full_content = result.markdown or ''
+                    content_length = len(full_content)
+
                     enhanced_results.append({
                         "url": url,
                         "title": url_info.get("title", ""),
                         "original_priority": url_info.get("priority_score", 0),
-                        "enhanced_content": markdown_content,
-                        "content_length": len(markdown_content),
+                        "enhanced_content": full_content[:_CONTENT_LIMIT],
+                        "content_length": content_length,
                         "source_type": "firecrawl_enhanced",
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": batch_timestamp
                     })
-                    
-                    print(f"    ✅ Success: {len(markdown_content)} characters")
+
+                    logger.info("    ✅ Success: %d characters", content_length)
                 else:
-                    print(f"    ❌ Failed: {result.error if hasattr(result, 'error') else 'Unknown error'}")
-                    
+                    logger.info("    ❌ Failed: %s", result.error if hasattr(result, 'error') else 'Unknown error')
+
             except Exception as e:
-                print(f"    ❌ Exception: {str(e)}")
+                logger.info("    ❌ Exception: %s", e)
                 continue
         
         if enhanced_results:
             # Add enhanced content to research results
             enhanced_contents = []
             for result in enhanced_results:
-                # Format enhanced content
+                # Format enhanced content, reusing the length captured at
+                # scrape time instead of re-measuring the string
+                content_length = result['content_length']
+                tail = '...' if content_length > 3000 else ''
                 formatted_content = f"""
 
 ## Deep Content Enhancement - {result['title']}
 
 Source: {result['url']}
-Content Length: {result['content_length']} characters
+Content Length: {content_length} characters
 
-{result['enhanced_content'][:3000]}{'...' if len(result['enhanced_content']) > 3000 else ''}
+{result['enhanced_content'][:3000]}{tail}
 
 ---
 """
@@ -157,16 +199,16 @@ Content Length: {result['content_length']} characters
                 "enhanced_sources_count": len(enhanced_results)
             })
             
-            print(f"✅ Content enhancement completed: {len(enhanced_results)} sources")
+            logger.info("✅ Content enhancement completed: %d sources", len(enhanced_results))
         else:
-            print("❌ Content enhancement failed, no content was successfully crawled")
+            logger.info("❌ Content enhancement failed, no content was successfully crawled")
             state_update["enhancement_status"] = "failed"
         
         return state_update
         
     except Exception as e:
         error_message = f"Content enhancement analysis node exception: {str(e)}"
-        print(f"❌ {error_message}")
+        logger.error("❌ %s", error_message)
         return {
             "enhancement_status": "error",
             "enhancement_error": error_message
@@ -184,28 +226,28 @@ def should_enhance_content(state: OverallState) -> str:
     """
     
     # Check Firecrawl availability
-    if not os.getenv("FIRECRAWL_API_KEY"):
-        print("Skipping content enhancement: FIRECRAWL_API_KEY is not configured")
+    if not _firecrawl_key():
+        logger.info("Skipping content enhancement: FIRECRAWL_API_KEY is not configured")
         return "continue_without_enhancement"
-    
+
     # Check research loop count (avoid enhancing in early loops)
     research_loop_count = state.get("research_loop_count", 0)
     if research_loop_count < 1:  # At least one research loop should be completed before considering enhancement
-        print(f"Skipping content enhancement: Research loop count is insufficient ({research_loop_count})")
+        logger.info("Skipping content enhancement: Research loop count is insufficient (%d)", research_loop_count)
         return "continue_without_enhancement"
-    
+
     # Check if enhancement was already performed (avoid duplicate enhancement)
     if state.get("enhancement_status") in ["completed", "skipped"]:
-        print("Skipping content enhancement: Enhancement was already completed")
+        logger.info("Skipping content enhancement: Enhancement was already completed")
         return "continue_without_enhancement"
-    
+
     # Check current findings count (at least some basic content should be available)
     current_findings = state.get("web_research_result", [])
     if len(current_findings) < 1:
-        print("⚠️ Skipping content enhancement: Missing basic research content")
+        logger.info("⚠️ Skipping content enhancement: Missing basic research content")
         return "continue_without_enhancement"
-    
-    print("✅ Enhancement conditions met, proceeding to content enhancement analysis")
+
+    logger.info("✅ Enhancement conditions met, proceeding to content enhancement analysis")
     return "analyze_enhancement_need"
 
 
@@ -223,27 +265,27 @@ def enhanced_reflection(state: OverallState, config: RunnableConfig) -> Reflecti
     enhanced_sources_count = state.get("enhanced_sources_count", 0)
     
     if enhancement_status == "completed" and enhanced_sources_count > 0:
-        print(f"📈 Content enhancement completed, adjusting reflection judgment")
-        print(f"  Enhanced {enhanced_sources_count} sources")
-        
+        logger.info("📈 Content enhancement completed, adjusting reflection judgment")
+        logger.info("  Enhanced %d sources", enhanced_sources_count)
+
         # If content enhancement was successful, be more inclined to consider the information sufficient
         # But still maintain the LLM's judgment weight
         if not reflection_result["is_sufficient"]:
             # Add some "bonus points" for enhanced content
             enhancement_boost = min(enhanced_sources_count * 0.3, 0.8)
-            print(f"  Boosting sufficiency assessment due to content enhancement (+{enhancement_boost:.1f})")
-            
+            logger.info("  Boosting sufficiency assessment due to content enhancement (+%.1f)", enhancement_boost)
+
             # If enhancement is significant, change "insufficient" to "sufficient"
             if enhancement_boost >= 0.6:
-                print("  ✅ Based on content enhancement results, information is now sufficient")
+                logger.info("  ✅ Based on content enhancement results, information is now sufficient")
                 reflection_result["is_sufficient"] = True
                 reflection_result["knowledge_gap"] = "Content has been sufficiently supplemented through deep crawling"
-    
+
     elif enhancement_status == "skipped":
-        print("📝 Content enhancement was skipped, using original reflection results")
-    
+        logger.info("📝 Content enhancement was skipped, using original reflection results")
+
     elif enhancement_status == "failed":
-        print("⚠️ Content enhancement failed, may need more research loops")
+        logger.info("⚠️ Content enhancement failed, may need more research loops")
     
     return reflection_result
 